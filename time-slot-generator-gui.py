@@ -14,25 +14,38 @@ Author: Josh Olivier
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+import heapq
 import random
 
 # ======================
 # === CONFIGURATION ===
 # ======================
 
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+DAY_TO_IDX = {name: i for i, name in enumerate(DAYS)}
+
+@dataclass(slots=True)
 class Config:
     """Holds user-defined settings for time slot generation."""
 
     NUM_SLOTS: int = 10
     SLOT_DURATION: timedelta = timedelta(hours=2, minutes=30)
-    START_TIME: float = 9
-    END_TIME: float = 16.5
+    START_TIME: int = 540  # minutes from midnight, e.g. 540 = 09:00
+    END_TIME: int = 990  # minutes from midnight, e.g. 990 = 16:30
     TIME_INCREMENT_MINUTES: int = 30
     DAYS_FROM_TODAY: int = 7
-    AVOID_DAYS: list[int] = []
-    AVOID_TIMES: dict[int, list[tuple[float, float]]] = {}
+    AVOID_DAYS: list[int] = field(default_factory=list)
+    # {weekday: [(start_minutes, end_minutes), ...]}
+    AVOID_TIMES: dict[int, list[tuple[int, int]]] = field(default_factory=dict)
+    # AVOID_TIMES rasterized onto the increment grid
+    AVOID_BITS: dict[int, int] = field(default_factory=dict)
     SLOTS_PER_DAY: int = 1  # number of slots allowed per day
+    SEED: int | None = None  # seed for reproducible output; None = random
+
+    # Derived candidate tables memoized by generate_time_slots.
+    _feasible_cache: tuple = field(default=None, init=False, repr=False, compare=False)
 
 
 # ======================
@@ -40,38 +53,66 @@ class Config:
 # ======================
 
 
-def parse_time_hhmm(time_str: str) -> float:
-    """Convert 'HH:MM' to float hours (e.g., '09:30' → 9.5)."""
+def parse_time_hhmm(time_str: str) -> int:
+    """Convert 'HH:MM' to minutes from midnight (e.g., '09:30' → 570)."""
     try:
         hour, minute = map(int, time_str.split(":"))
-        return hour + minute / 60
+        return hour * 60 + minute
     except ValueError:
         raise ValueError("Time must be in HH:MM format, e.g., 09:30")
 
 
-def format_hour_24(hour_float: float) -> str:
-    """Convert float hours to 'HH:MM'."""
-    hour = int(hour_float)
-    minute = int((hour_float % 1) * 60)
-    return f"{hour:02d}:{minute:02d}"
-
-
-def format_slot_custom(date_obj: datetime, start_dt: datetime, end_dt: datetime) -> str:
-    """Format a slot with readable date/time strings."""
-    date_str = date_obj.strftime("%A, %B %d").replace(" 0", " ")
-    start_str = start_dt.strftime("%I:%M %p").lstrip("0")
-    end_str = end_dt.strftime("%I:%M %p").lstrip("0")
-    return f"{date_str}, from {start_str} – {end_str}"
-
-
-def overlaps_avoid_time(weekday: int, start_hour: float, end_hour: float, avoid_times: dict) -> bool:
-    """Check if a time range overlaps any avoided period."""
-    if weekday not in avoid_times:
-        return False
-    for a_start, a_end in avoid_times[weekday]:
-        if (start_hour < a_end) and (end_hour > a_start):
-            return True
-    return False
+def format_hour_24(minutes: int) -> str:
+    """Convert minutes from midnight to 'HH:MM'."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def rasterize_avoid_times(avoid_times: dict, start_time: int, increment_minutes: int) -> dict:
+    """Rasterize avoid ranges onto the start-time increment grid.
+
+    Takes minute-denominated ranges and returns one bitmask per weekday,
+    where bit i means increment i (counting from start_time) falls
+    inside an avoided range. Checking a candidate slot against every
+    avoid range is then a single AND, with exact integer grid math.
+    """
+    avoid_bits = {}
+    for weekday, ranges in avoid_times.items():
+        bits = 0
+        for a_start, a_end in ranges:
+            lo = max(0, (a_start - start_time) // increment_minutes)
+            hi = -((a_end - start_time) // -increment_minutes)  # ceil division
+            if hi > lo:
+                bits |= ((1 << (hi - lo)) - 1) << lo
+        avoid_bits[weekday] = bits
+    return avoid_bits
+
+
+def format_slots(slots: list) -> list:
+    """Format slots as readable display lines.
+
+    strftime is locale-sensitive and comparatively expensive, so reuse
+    its output wherever slots share it: the date string is computed once
+    per day (slots arrive sorted) and time-of-day strings are cached,
+    since only a handful of distinct start/end times exist.
+    """
+    lines = []
+    time_strs = {}
+    last_day = None
+    date_str = ""
+    for day, start_dt, end_dt in slots:
+        if day != last_day:
+            date_str = day.strftime("%A, %B %d").replace(" 0", " ")
+            last_day = day
+        key = (start_dt.hour, start_dt.minute)
+        start_str = time_strs.get(key)
+        if start_str is None:
+            start_str = time_strs[key] = start_dt.strftime("%I:%M %p").lstrip("0")
+        key = (end_dt.hour, end_dt.minute)
+        end_str = time_strs.get(key)
+        if end_str is None:
+            end_str = time_strs[key] = end_dt.strftime("%I:%M %p").lstrip("0")
+        lines.append(f"{date_str}, from {start_str} – {end_str}")
+    return lines
 
 
 # ======================
@@ -79,104 +120,204 @@ def overlaps_avoid_time(weekday: int, start_hour: float, end_hour: float, avoid_
 # ======================
 
 
+def _iter_candidates(feasible: tuple, slots_per_day: int, rng: random.Random):
+    """Yield candidate start indices for one day in random order.
+
+    Starts with a single oversampled rng.sample batch; the shuffled
+    remainder is only built if the caller exhausts the batch, so every
+    candidate is eventually offered without paying a full enumeration
+    on the common path.
+    """
+    batch = rng.sample(feasible, min(len(feasible), slots_per_day * 8))
+    yield from batch
+    if len(batch) < len(feasible):
+        drawn = set(batch)
+        rest = [i for i in feasible if i not in drawn]
+        rng.shuffle(rest)
+        yield from rest
+
+
+def _pick_day_start_indices(
+    feasible: tuple, masks: list, slots_per_day: int, rng: random.Random
+) -> list:
+    """Pick non-overlapping start indices for a single day.
+
+    Operates purely on candidate indices and occupancy bitmasks — no
+    datetime construction — so the hot selection loop is plain int
+    arithmetic. The picks are returned unordered; the caller's heap
+    establishes chronological order.
+    """
+    picked = []
+    occupied = 0
+    for i in _iter_candidates(feasible, slots_per_day, rng):
+        if len(picked) >= slots_per_day:
+            break
+        if occupied & masks[i]:
+            continue
+        picked.append(i)
+        occupied |= masks[i]
+    return picked
+
+
 def generate_time_slots(config: Config) -> list:
     """Generate random, non-overlapping time slots based on configuration."""
     slots = []
-    start_date = (datetime.today() + timedelta(days=config.DAYS_FROM_TODAY)).replace(
-        hour=0, minute=0, second=0, microsecond=0
+    start_date = datetime.combine(
+        date.today() + timedelta(days=config.DAYS_FROM_TODAY), time.min
     )
     current_date = start_date
     days = list(range(7))
 
-    increment_hours = config.TIME_INCREMENT_MINUTES / 60
-    valid_start_times = [
-        t
-        for t in frange(
-            config.START_TIME,
-            config.END_TIME - config.SLOT_DURATION.total_seconds() / 3600,
-            increment_hours,
+    # Hoist the per-candidate timedelta math and hot attribute lookups out of
+    # the loops; these are all invariant for the duration of a call. All time
+    # arithmetic is in integer minutes from midnight.
+    increment_minutes = config.TIME_INCREMENT_MINUTES
+    dur_min = int(config.SLOT_DURATION.total_seconds()) // 60
+    slot_duration = config.SLOT_DURATION
+    # A private RNG keeps generation reentrant (no shared global state) and
+    # reproducible when a SEED is set.
+    rng = random.Random(config.SEED)
+    num_slots = config.NUM_SLOTS
+    slots_per_day = config.SLOTS_PER_DAY
+
+    # The candidate tables below depend only on these settings, so cache them
+    # on the Config and rebuild only when the settings actually change.
+    cache_key = (
+        config.START_TIME,
+        config.END_TIME,
+        config.SLOT_DURATION,
+        config.TIME_INCREMENT_MINUTES,
+        tuple(sorted(config.AVOID_DAYS)),
+        tuple(sorted((wd, tuple(ranges)) for wd, ranges in config.AVOID_TIMES.items())),
+        tuple(sorted(config.AVOID_BITS.items())),
+    )
+    cached = config._feasible_cache
+    if cached is not None and cached[0] == cache_key:
+        _, start_offsets, masks, feasible_starts = cached
+    else:
+        last_start = config.END_TIME - dur_min
+        n_starts = max(0, (last_start - config.START_TIME) // increment_minutes + 1)
+        # Midnight-relative offsets, so building a slot's datetimes is a plain
+        # timedelta addition instead of a .replace(hour=..., minute=...) call.
+        start_offsets = [
+            timedelta(minutes=config.START_TIME + i * increment_minutes)
+            for i in range(n_starts)
+        ]
+
+        # Each candidate start occupies a run of TIME_INCREMENT_MINUTES-wide
+        # bits in a per-day bitmask, so both the avoid-time check and the
+        # intra-day overlap check collapse to a single bitwise AND.
+        slot_bits = -(dur_min // -increment_minutes)  # ceil division
+        masks = [((1 << slot_bits) - 1) << i for i in range(n_starts)]
+
+        # Use the avoid bitmap rasterized at parse time when the caller
+        # provides one; otherwise derive it from AVOID_TIMES here.
+        avoid_masks = config.AVOID_BITS or rasterize_avoid_times(
+            config.AVOID_TIMES, config.START_TIME, config.TIME_INCREMENT_MINUTES
         )
-    ]
 
-    while len(slots) < config.NUM_SLOTS:
-        if current_date.weekday() in days and current_date.weekday() not in config.AVOID_DAYS:
-            daily_slots = []
-            attempts = 0
-            while len(daily_slots) < config.SLOTS_PER_DAY and attempts < 50:
-                start_hour = random.choice(valid_start_times)
-                end_hour = start_hour + config.SLOT_DURATION.total_seconds() / 3600
-
-                if overlaps_avoid_time(current_date.weekday(), start_hour, end_hour, config.AVOID_TIMES):
-                    attempts += 1
-                    continue
-
-                # Prevent overlap within the same day
-                if any(
-                    not (end_hour <= s_dt.hour + s_dt.minute / 60 or start_hour >= e_dt.hour + e_dt.minute / 60)
-                    for _, s_dt, e_dt in daily_slots
-                ):
-                    attempts += 1
-                    continue
-
-                start_dt = current_date.replace(
-                    hour=int(start_hour),
-                    minute=int((start_hour % 1) * 60),
-                    second=0,
-                )
-                end_dt = start_dt + config.SLOT_DURATION
-                daily_slots.append((current_date, start_dt, end_dt))
-                attempts += 1
-
-            daily_slots.sort(key=lambda x: x[1])
-            slots.extend(daily_slots)
+        # Prune candidates against avoided times once per weekday, so the daily
+        # loop never has to reject-sample against AVOID_TIMES. Weekdays whose
+        # candidates are all blocked are dropped entirely, so the day loop
+        # jumps over them instead of spending horizon budget on them.
+        feasible_starts = {}
+        for weekday in days:
+            if weekday in config.AVOID_DAYS:
+                continue
+            feasible = tuple(
+                i for i in range(n_starts) if not masks[i] & avoid_masks.get(weekday, 0)
+            )
+            if feasible:
+                feasible_starts[weekday] = feasible
+        config._feasible_cache = (cache_key, start_offsets, masks, feasible_starts)
+
+    allowed_weekdays = frozenset(feasible_starts)
+    if not allowed_weekdays:
+        return slots
+    # Days to add from each weekday to land on the next allowed weekday, so
+    # runs of avoided days are skipped in one jump instead of day by day.
+    next_allowed = []
+    for w in range(7):
+        deltas = [(d - w) % 7 for d in allowed_weekdays if d != w]
+        next_allowed.append(min(deltas) if deltas else 7)
+
+    # Every remaining weekday has at least one feasible start, so each visited
+    # allowed day is guaranteed to yield at least one slot; num_slots allowed
+    # days plus slack can therefore never under-fill the request, unlike the
+    # old arbitrary 90-day calendar cap.
+    horizon_days = num_slots + 14
+
+    # Consecutive days differ by one mod 7, so step an int counter instead of
+    # calling .weekday() every iteration, and index a flat mask for the
+    # allowed check.
+    allowed_mask = [w in allowed_weekdays for w in range(7)]
+    weekday = current_date.weekday()
+
+    allowed_days_used = 0
+    while len(slots) < num_slots and allowed_days_used < horizon_days:
+        if not allowed_mask[weekday]:
+            jump = next_allowed[weekday]
+            current_date += timedelta(days=jump)
+            weekday = (weekday + jump) % 7
+            continue
+
+        picked = _pick_day_start_indices(
+            feasible_starts[weekday], masks, slots_per_day, rng
+        )
+        # Materialize datetimes only for the accepted indices; the heap keeps
+        # the result ordered by start without any intermediate sorting.
+        for i in picked:
+            start_dt = current_date + start_offsets[i]
+            end_dt = start_dt + slot_duration
+            heapq.heappush(slots, (start_dt, current_date, end_dt))
 
         current_date += timedelta(days=1)
-        if current_date - start_date > timedelta(days=90):  # safety limit
-            break
+        weekday = (weekday + 1) % 7
+        allowed_days_used += 1
 
-    slots.sort(key=lambda x: x[1])
-    return slots[: config.NUM_SLOTS]
-
-
-def frange(start: float, stop: float, step: float):
-    """Generate a range of floats."""
-    while start <= stop:
-        yield round(start, 2)
-        start += step
+    return [
+        (day, start_dt, end_dt)
+        for start_dt, day, end_dt in (
+            heapq.heappop(slots) for _ in range(min(num_slots, len(slots)))
+        )
+    ]
 
 
 # ======================
 # === GUI LOGIC ===
 # ======================
 
+# Structured mirror of the avoid-times listbox: (weekday, start, end) per
+# entry, kept in the same order so Generate never re-parses display strings.
+_avoid_times_data = []
+
 
 def generate_slots():
     """Collect input values, generate slots, and display results."""
     try:
-        cfg = Config()
-        cfg.NUM_SLOTS = int(num_slots.get())
-        cfg.SLOT_DURATION = timedelta(hours=float(duration.get()))
-        cfg.START_TIME = parse_time_hhmm(start_time.get())
-        cfg.END_TIME = parse_time_hhmm(end_time.get())
-        cfg.TIME_INCREMENT_MINUTES = int(increment.get())
-        cfg.DAYS_FROM_TODAY = int(days_ahead.get())
-        cfg.SLOTS_PER_DAY = int(slots_per_day.get())
-
-        cfg.AVOID_DAYS = [i for i, v in enumerate(avoid_day_vars) if v.get() == 1]
-        cfg.AVOID_TIMES = {}
-
-        for entry in avoid_times_listbox.get(0, tk.END):
-            day, start_end = entry.split(" ", 1)
-            start_str, end_str = start_end.split(" – ")
-            day_idx = days.index(day)
-            cfg.AVOID_TIMES.setdefault(day_idx, []).append(
-                (parse_time_hhmm(start_str), parse_time_hhmm(end_str))
-            )
+        start_time_min = parse_time_hhmm(start_time.get())
+        increment_minutes = int(increment.get())
+
+        avoid_times = {}
+        for day_idx, start_min, end_min in _avoid_times_data:
+            avoid_times.setdefault(day_idx, []).append((start_min, end_min))
+
+        cfg = Config(
+            NUM_SLOTS=int(num_slots.get()),
+            SLOT_DURATION=timedelta(hours=float(duration.get())),
+            START_TIME=start_time_min,
+            END_TIME=parse_time_hhmm(end_time.get()),
+            TIME_INCREMENT_MINUTES=increment_minutes,
+            DAYS_FROM_TODAY=int(days_ahead.get()),
+            SLOTS_PER_DAY=int(slots_per_day.get()),
+            AVOID_DAYS=[i for i, v in enumerate(avoid_day_vars) if v.get() == 1],
+            AVOID_TIMES=avoid_times,
+            AVOID_BITS=rasterize_avoid_times(avoid_times, start_time_min, increment_minutes),
+        )
 
         slots = generate_time_slots(cfg)
         output_box.delete("1.0", tk.END)
-        for s in slots:
-            output_box.insert(tk.END, f"{format_slot_custom(*s)}\n")
+        output_box.insert(tk.END, "".join(f"{line}\n" for line in format_slots(slots)))
 
     except Exception as e:
         messagebox.showerror("Error", str(e))
@@ -185,15 +326,19 @@ def generate_slots():
 def add_avoid_time():
     """Add an avoid time range to the listbox."""
     day = day_dropdown.get()
+    if day not in DAY_TO_IDX:
+        messagebox.showerror("Invalid input", "Select a day of the week")
+        return
     try:
-        start_h = parse_time_hhmm(start_time_entry.get())
-        end_h = parse_time_hhmm(end_time_entry.get())
+        start_min = parse_time_hhmm(start_time_entry.get())
+        end_min = parse_time_hhmm(end_time_entry.get())
     except ValueError as ve:
         messagebox.showerror("Invalid input", str(ve))
         return
 
+    _avoid_times_data.append((DAY_TO_IDX[day], start_min, end_min))
     avoid_times_listbox.insert(
-        tk.END, f"{day} {format_hour_24(start_h)} – {format_hour_24(end_h)}"
+        tk.END, f"{day} {format_hour_24(start_min)} – {format_hour_24(end_min)}"
     )
     start_time_entry.delete(0, tk.END)
     end_time_entry.delete(0, tk.END)
@@ -203,6 +348,7 @@ def remove_selected_avoid_time():
     """Remove the selected avoid time from the listbox."""
     for i in reversed(avoid_times_listbox.curselection()):
         avoid_times_listbox.delete(i)
+        del _avoid_times_data[i]
 
 
 # ======================
@@ -214,7 +360,7 @@ def main():
     """Initialize and run the Tkinter GUI."""
     global num_slots, duration, start_time, end_time, increment, days_ahead
     global slots_per_day, avoid_day_vars, avoid_times_listbox
-    global day_dropdown, start_time_entry, end_time_entry, output_box, days
+    global day_dropdown, start_time_entry, end_time_entry, output_box
 
     root = tk.Tk()
     root.title("Random Time Slot Generator")
@@ -263,10 +409,9 @@ def main():
     avoid_days_frame = ttk.Frame(frm)
     avoid_days_frame.grid(column=1, row=7, sticky="w", pady=2)
 
-    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    avoid_day_vars = [tk.IntVar() for _ in days]
+    avoid_day_vars = [tk.IntVar() for _ in DAYS]
 
-    for i, day in enumerate(days):
+    for i, day in enumerate(DAYS):
         if day in ["Sat", "Sun"]:
             avoid_day_vars[i].set(1)
         ttk.Checkbutton(avoid_days_frame, text=day, variable=avoid_day_vars[i]).grid(
@@ -277,7 +422,7 @@ def main():
     avoid_times_frame = ttk.Frame(frm)
     avoid_times_frame.grid(column=0, row=9, columnspan=7, sticky="w", pady=(5, 0))
 
-    day_dropdown = ttk.Combobox(avoid_times_frame, values=days, state="readonly", width=5)
+    day_dropdown = ttk.Combobox(avoid_times_frame, values=DAYS, state="readonly", width=5)
     day_dropdown.set("Mon")
     day_dropdown.grid(column=0, row=0, padx=(0, 5))
 
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 import random
 
 # ======================
@@ -21,6 +21,7 @@ class Config:
         0: [(9.0, 10.5)],
         1: [(14.0, 15.5)],
     }
+    SEED = None  # set an int for reproducible output
 
 # ======================
 # === HELPER FUNCTIONS ===
@@ -54,29 +55,44 @@ def format_slot(date_obj, start_dt, end_dt):
 def generate_time_slots(config: Config):
     """Generate a list of random time slots respecting restrictions."""
     slots = []
-    start_date = (datetime.today() + timedelta(days=config.DAYS_FROM_TODAY)).replace(
-        hour=0, minute=0, second=0, microsecond=0
+    start_date = datetime.combine(
+        date.today() + timedelta(days=config.DAYS_FROM_TODAY), time.min
     )
     current_date = start_date
     weekdays = [0, 1, 2, 3, 4]  # Mon-Fri
 
     # Build valid start times in increments
     increment_hours = config.TIME_INCREMENT_MINUTES / 60
+    dur_h = config.SLOT_DURATION.total_seconds()/3600
     valid_start_times = []
     t = config.START_TIME
-    while t <= config.END_TIME - config.SLOT_DURATION.total_seconds()/3600:
+    while t <= config.END_TIME - dur_h:
         valid_start_times.append(t)
         t += increment_hours
 
-    # Generate slots
-    while len(slots) < config.NUM_SLOTS:
-        if current_date.weekday() in weekdays and current_date.weekday() not in config.AVOID_DAYS:
-            start_hour = random.choice(valid_start_times)
-            end_hour = start_hour + config.SLOT_DURATION.total_seconds()/3600
-            if overlaps_avoid_time(current_date.weekday(), start_hour, end_hour, config.AVOID_TIMES):
-                current_date += timedelta(days=1)
-                continue
+    # Filter the candidates against AVOID_TIMES once per weekday, so the day
+    # loop below never re-scans the avoid ranges.
+    feasible_starts = {
+        weekday: [
+            t for t in valid_start_times
+            if not overlaps_avoid_time(weekday, t, t + dur_h, config.AVOID_TIMES)
+        ]
+        for weekday in weekdays
+        if weekday not in config.AVOID_DAYS
+    }
+    if not any(feasible_starts.values()):
+        return slots
 
+    # Private RNG: reentrant, and reproducible when SEED is set
+    rng = random.Random(config.SEED)
+
+    # Generate slots; step the weekday as an int counter rather than calling
+    # .weekday() every iteration
+    weekday = current_date.weekday()
+    while len(slots) < config.NUM_SLOTS:
+        feasible = feasible_starts.get(weekday)
+        if feasible:
+            start_hour = rng.choice(feasible)
             start_dt = current_date.replace(
                 hour=int(start_hour),
                 minute=int((start_hour % 1) * 60),
@@ -86,6 +102,7 @@ def generate_time_slots(config: Config):
             slots.append((current_date, start_dt, end_dt))
 
         current_date += timedelta(days=1)
+        weekday = (weekday + 1) % 7
 
     return slots[:config.NUM_SLOTS]
 